@@ -7,6 +7,7 @@ Appends result to the published index series CSV.
 
 Usage:
     python calculate.py [--end-date YYYY-MM-DD] [--window 7] [--model h100-sxm-us]
+    python calculate.py [--end-date YYYY-MM-DD] --all-models
 
 Output:
     outputs/cri-h100-index.csv                     — append-only published series
@@ -14,12 +15,39 @@ Output:
 """
 
 import argparse
+import asyncio
+import contextlib
+import copy
 import csv
+import functools
+import io
 import json
-import statistics
-from datetime import datetime, timedelta, timezone
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 
+import numpy as np
+
+from snapshot_csv import split_prices
+
+try:
+    import numba
+except ImportError:  # optional accelerator — the numpy path is used as-is
+    numba = None
+
+try:
+    import orjson
+except ImportError:  # optional accelerator — stdlib json is used instead
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # optional accelerator — the csv module is used instead
+    pacsv = None
+
 # ---------------------------------------------------------------------------
 # Constants — per CCIR Methodology v1.1.1
 # ---------------------------------------------------------------------------
@@ -29,9 +57,17 @@ WINDOW_DAYS          = 7
 MIN_OBSERVATIONS_DAY = 8     # Minimum to include a day in window
 MIN_VALID_DAYS       = 3     # Minimum valid days to publish; else low-confidence flag
 
+# Prices are held, cached and reduced in float64 end to end. Snapshots store
+# dph_per_gpu to 6 decimals, which float32 (~7 significant digits) cannot
+# represent for prices >= $10, and narrower accumulation can move a rounded
+# summary value — verify.py must reproduce every published figure exactly.
+PRICE_DTYPE = np.float64
+
 DATA_DIR       = Path("data")
 INDEX_OUTPUT   = Path("outputs/cri-h100-index.csv")
 AUDIT_DIR      = Path("outputs/audits")
+CACHE_DIR      = Path("outputs/.cache")   # Per-day cleaned prices; safe to delete
+CACHE_FORMAT   = 3                        # Bump when the cached payload changes meaning
 
 # Model configuration — determines which data directory to read
 MODEL_CONFIGS = {
@@ -50,18 +86,76 @@ MODEL_CONFIGS = {
 # Load daily data
 # ---------------------------------------------------------------------------
 
-def load_daily_prices(model_dir: Path, date_str: str):
-    path = model_dir / f"{date_str}.csv"
-    if not path.exists():
-        return None
-    prices = []
+def _parse_price(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _read_prices_arrow(path: Path):
+    """Column-pruned read via pyarrow's C++ parser; None if it can't handle the file."""
+    try:
+        table = pacsv.read_csv(path, convert_options=pacsv.ConvertOptions(
+            include_columns=["dph_per_gpu"],
+            column_types={"dph_per_gpu": pa.float64()},
+        ))
+    except (pa.ArrowInvalid, pa.ArrowKeyError):
+        return None  # Empty file, missing column or a non-numeric value
+    return table.column(0).to_numpy()  # Nulls come back as NaN
+
+
+def _read_prices_csv(path: Path):
     with open(path, newline="") as f:
-        for row in csv.DictReader(f):
-            try:
-                prices.append(float(row["dph_per_gpu"]))
-            except (KeyError, ValueError):
-                continue
-    return prices if prices else None
+        # Resolve the column position once rather than building a dict per row
+        try:
+            idx = next(csv.reader([f.readline()])).index("dph_per_gpu")
+        except (StopIteration, ValueError):
+            return None
+        # Snapshots without quoted fields never need the csv module
+        start  = f.tell()
+        prices = split_prices(f, idx)
+        if prices is not None:
+            return prices
+        f.seek(start)
+        return np.fromiter(
+            (_parse_price(row[idx]) if len(row) > idx else np.nan for row in csv.reader(f)),
+            dtype=PRICE_DTYPE,
+        )
+
+
+def list_available(model_dir: Path) -> frozenset:
+    """File names in model_dir from a single directory scan (empty if absent)."""
+    try:
+        with os.scandir(model_dir) as entries:
+            return frozenset(entry.name for entry in entries)
+    except FileNotFoundError:
+        return frozenset()
+
+
+def load_daily_prices(model_dir: Path, date_str: str, available: frozenset = None):
+    """
+    Load the dph_per_gpu column of one daily snapshot as a float64 array.
+    Unparseable or non-finite values are dropped. Returns None if the file
+    is missing or holds no valid prices.
+
+    If available (see list_available) is given, it decides whether the file
+    exists, saving a stat call per day.
+    """
+    name = f"{date_str}.csv"
+    path = model_dir / name
+    if available is not None:
+        if name not in available:
+            return None
+    elif not path.exists():
+        return None
+    prices = _read_prices_arrow(path) if pacsv is not None else None
+    if prices is None:
+        prices = _read_prices_csv(path)
+    if prices is None:
+        return None
+    prices = prices[np.isfinite(prices)]
+    return prices if prices.size else None
 
 
 def load_daily_meta(model_dir: Path, date_str: str):
@@ -75,75 +169,242 @@ def load_daily_meta(model_dir: Path, date_str: str):
 # Outlier removal — per CCIR Methodology v1.1.1
 # ---------------------------------------------------------------------------
 
-def remove_outliers(prices: list, sigma: float = OUTLIER_SIGMA):
+def _jit(func):
+    """Compile func with numba when it is installed; otherwise return it unchanged."""
+    if numba is None:
+        return func
+    # No fastmath: reassociated sums would drift from verify.py's results.
+    return numba.njit(cache=True)(func)
+
+
+@_jit
+def _clean_prices(prices, sigma):
+    # One sort serves both the 10% trim here and the caller's daily median.
+    sorted_p = np.sort(prices)
+    n        = sorted_p.size
+    trim_n   = max(1, int(n * 0.10))
+    # All prices equal: the stdev is exactly 0 and v1.1.1 keeps every one.
+    # Tested directly, as the float mean below can leave a ~1e-17 residue
+    # that would put every price "beyond" 2.5 sigma.
+    if sorted_p[0] == sorted_p[-1]:
+        return sorted_p
+    t_mean   = sorted_p[trim_n:n - trim_n].mean()
+    # Sample stdev (ddof=1) spelled out — numba's ndarray.std takes no ddof.
+    stdev    = np.sqrt(((sorted_p - sorted_p.mean()) ** 2).sum() / (n - 1))
+
+    if stdev == 0:
+        return sorted_p
+    # |x - t_mean| computed in place in one scratch buffer rather than as two
+    # temporaries (difference, then abs)
+    dev = sorted_p - t_mean
+    np.abs(dev, dev)
+    # Boolean indexing preserves order, so the result stays sorted.
+    return sorted_p[dev <= sigma * stdev]
+
+
+def remove_outliers(prices: np.ndarray, sigma: float = OUTLIER_SIGMA):
     """
     1. Compute trimmed mean (drop top/bottom 10%)
     2. Compute stdev of full series
     3. Remove observations > sigma * stdev from trimmed mean
-    Returns (cleaned_prices, n_removed)
+    Returns (cleaned_prices, n_removed). cleaned_prices is always sorted
+    ascending, so callers may read order statistics (see sorted_median)
+    without sorting again.
     """
-    if len(prices) < 4:
-        return prices, 0
+    n = prices.size
+    if n < 4:
+        return np.sort(prices), 0
 
-    sorted_p = sorted(prices)
-    trim_n   = max(1, int(len(sorted_p) * 0.10))
-    trimmed  = sorted_p[trim_n:-trim_n]
-    t_mean   = statistics.mean(trimmed)
-    stdev    = statistics.stdev(prices)
+    # Compiled code needs a contiguous float64 buffer of its own.
+    cleaned = _clean_prices(np.ascontiguousarray(prices, dtype=PRICE_DTYPE), sigma)
+    return cleaned, n - cleaned.size
 
-    if stdev == 0:
-        return prices, 0
 
-    threshold = sigma * stdev
-    cleaned   = [p for p in prices if abs(p - t_mean) <= threshold]
-    return cleaned, len(prices) - len(cleaned)
+def partition_median(prices: np.ndarray) -> float:
+    """
+    Median via np.partition (introselect: O(n) worst case, unaffected by
+    runs of identical prices). Even-length input takes the midpoint of the
+    two middle values — the methodology's median, not a "lower" quantile.
+    """
+    n   = prices.size
+    mid = n // 2
+    if n % 2:
+        return float(np.partition(prices, mid)[mid])
+    lo, hi = np.partition(prices, [mid - 1, mid])[mid - 1:mid + 1]
+    return float((lo + hi) / 2)
+
+
+def sorted_median(sorted_prices: np.ndarray) -> float:
+    """Median of an already-sorted, non-empty array (same value as np.median)."""
+    mid = sorted_prices.size // 2
+    if sorted_prices.size % 2:
+        return float(sorted_prices[mid])
+    return float((sorted_prices[mid - 1] + sorted_prices[mid]) / 2)
+
+# ---------------------------------------------------------------------------
+# Per-day cache
+# ---------------------------------------------------------------------------
+
+def cached_cleaned(model_dir: Path, date_str: str, available: frozenset = None):
+    """
+    Return (n_raw, cleaned_prices, n_removed) for one day, or None if the
+    snapshot is missing or empty. Every day is cleaned whatever its size;
+    the MIN_OBSERVATIONS_DAY check is left to the caller, so the cached
+    payload doesn't depend on it.
+
+    Results are cached in CACHE_DIR/<model>/<date>.npz, keyed on the CSV's
+    size, mtime, the outlier sigma and CACHE_FORMAT, so a rewritten snapshot
+    or a methodology change invalidates the entry automatically.
+    """
+    csv_name = f"{date_str}.csv"
+    if available is not None and csv_name not in available:
+        return None
+    csv_path = model_dir / csv_name
+    try:
+        st = csv_path.stat()
+    except FileNotFoundError:
+        return None
+
+    key        = np.array([st.st_size, st.st_mtime_ns], dtype=np.int64)
+    cache_path = CACHE_DIR / model_dir.name / f"{date_str}.npz"
+    try:
+        with np.load(cache_path) as cached:
+            # Each cached[...] lookup reads its member from the archive again,
+            # so the array is read once, and only once the key has matched
+            if (cached["format"] == CACHE_FORMAT and cached["sigma"] == OUTLIER_SIGMA
+                    and np.array_equal(cached["key"], key)):
+                cleaned = cached["cleaned"]
+                if cleaned.dtype == PRICE_DTYPE:
+                    return int(cached["n_raw"]), cleaned, int(cached["n_removed"])
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        pass  # Missing or unreadable entry — recompute below
+
+    raw = load_daily_prices(model_dir, date_str, available)
+    if raw is None:
+        return None
+    cleaned, n_removed = remove_outliers(raw)
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(".tmp.npz")
+    np.savez(tmp_path, cleaned=cleaned, n_raw=raw.size, n_removed=n_removed,
+             key=key, sigma=OUTLIER_SIGMA, format=CACHE_FORMAT)
+    tmp_path.replace(cache_path)
+    return raw.size, cleaned, n_removed
 
 # ---------------------------------------------------------------------------
 # Index calculation
 # ---------------------------------------------------------------------------
 
+def window_summary(daily_arrays: list, all_prices: np.ndarray) -> dict:
+    """
+    Summary statistics for the merged window. Daily arrays are sorted (see
+    remove_outliers), so min/max come from their endpoints without scanning
+    all_prices, and the mean is computed once and reused for the sample
+    stdev — the same arithmetic as ndarray.std(ddof=1) minus its own mean pass.
+    """
+    n    = all_prices.size
+    mean = all_prices.mean()
+    return {
+        "min":   round(float(min(a[0] for a in daily_arrays)), 4),
+        "max":   round(float(max(a[-1] for a in daily_arrays)), 4),
+        "mean":  round(float(mean), 4),
+        "stdev": round(float(np.sqrt(((all_prices - mean) ** 2).sum() / (n - 1))), 4)
+                 if n > 1 else None,
+    }
+
+
+def window_dates(end_date: str, window_days: int):
+    """Yield the window's ISO dates, oldest first, without building a list."""
+    end = date.fromisoformat(end_date)
+    return ((end - timedelta(days=i)).isoformat()
+            for i in range(window_days - 1, -1, -1))
+
+
+def _file_stat_key(path: Path):
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _window_fingerprint(model_dir: Path, dates, available: frozenset) -> tuple:
+    """(mtime_ns, size) of each day's CSV in the window; None for missing days."""
+    return tuple(
+        _file_stat_key(model_dir / f"{date_str}.csv") if f"{date_str}.csv" in available else None
+        for date_str in dates
+    )
+
+
 def calculate(model_dir: Path, end_date: str, window_days: int = WINDOW_DAYS,
               index_name: str = "CRI-H100") -> dict:
-    end   = datetime.strptime(end_date, "%Y-%m-%d").date()
-    dates = [(end - timedelta(days=i)).strftime("%Y-%m-%d")
-             for i in range(window_days - 1, -1, -1)]
-
-    all_prices      = []
+    """
+    Memoized within the process on the arguments plus the mtime/size of
+    every CSV in the window, so a rewritten or newly collected snapshot
+    forces a recompute. Each call returns its own copy of the result,
+    stamped with this call's calculated_utc.
+    """
+    available   = list_available(model_dir)
+    fingerprint = _window_fingerprint(model_dir, window_dates(end_date, window_days), available)
+    result = copy.deepcopy(_calculate_memo(model_dir, end_date, window_days, index_name,
+                                           fingerprint))
+    if result["index_value"] is not None:
+        result["calculated_utc"] = datetime.now(timezone.utc).isoformat()
+        # Index CSV columns are fixed here once, so the write path does no dict
+        # lookups. write_audit leaves "_"-prefixed keys out of the audit trail.
+        result["_csv_row"] = _index_fields(result)
+    return result
+
+
+@functools.lru_cache(maxsize=128)
+def _calculate_memo(model_dir: Path, end_date: str, window_days: int,
+                    index_name: str, fingerprint: tuple) -> dict:
+    # Keyed on the window's own files only: snapshots outside it never
+    # invalidate the entry. The fingerprint also says which days exist.
+    dates     = window_dates(end_date, window_days)
+    available = frozenset(f"{date_str}.csv" for date_str, key in zip(dates, fingerprint)
+                          if key is not None)
+    return _calculate(model_dir, end_date, window_days, index_name, available)
+
+
+def _calculate(model_dir: Path, end_date: str, window_days: int,
+               index_name: str, available: frozenset = None) -> dict:
+    daily_arrays    = []
     daily_summaries = []
     valid_days      = 0
 
-    for date_str in dates:
-        raw = load_daily_prices(model_dir, date_str)
+    for date_str in window_dates(end_date, window_days):
+        day = cached_cleaned(model_dir, date_str, available)
 
-        if raw is None:
+        if day is None:
             daily_summaries.append({"date": date_str, "status": "missing", "n": 0})
             continue
 
-        if len(raw) < MIN_OBSERVATIONS_DAY:
+        n_raw, cleaned, n_removed = day
+        if n_raw < MIN_OBSERVATIONS_DAY:
             daily_summaries.append({"date": date_str, "status": "low_confidence",
-                                     "n_raw": len(raw), "n_used": 0})
+                                     "n_raw": n_raw, "n_used": 0})
             continue
 
-        cleaned, n_removed = remove_outliers(raw)
-        if not cleaned:
+        if cleaned.size == 0:
             daily_summaries.append({"date": date_str, "status": "empty_after_outlier_removal",
-                                     "n_raw": len(raw), "n_used": 0})
+                                     "n_raw": n_raw, "n_used": 0})
             continue
 
-        all_prices.extend(cleaned)
+        daily_arrays.append(cleaned)
         valid_days += 1
         daily_summaries.append({
             "date":      date_str,
             "status":    "included",
-            "n_raw":     len(raw),
+            "n_raw":     n_raw,
             "n_removed": n_removed,
-            "n_used":    len(cleaned),
-            "daily_median": round(statistics.median(cleaned), 4),
-            "daily_mean":   round(statistics.mean(cleaned), 4),
+            "n_used":    cleaned.size,
+            "daily_median": round(sorted_median(cleaned), 4),
+            "daily_mean":   round(float(cleaned.mean()), 4),
         })
 
     # Index value
-    if not all_prices:
+    if not daily_arrays:
         return {
             "end_date":      end_date,
             "index_name":    index_name,
@@ -154,101 +415,130 @@ def calculate(model_dir: Path, end_date: str, window_days: int = WINDOW_DAYS,
             "daily":         daily_summaries,
         }
 
-    index_value  = round(statistics.median(all_prices), 4)
+    all_prices   = np.concatenate(daily_arrays)
+    n_obs        = all_prices.size
+    index_value  = round(partition_median(all_prices), 4)
     low_conf     = valid_days < MIN_VALID_DAYS
     low_conf_why = f"only {valid_days} valid days in {window_days}-day window" if low_conf else None
 
-    return {
+    result = {
         "ccir_version":   "1.1.1",
         "index_name":     index_name,
         "end_date":       end_date,
         "window_days":    window_days,
         "index_value":    index_value,
-        "n_observations": len(all_prices),
+        "n_observations": n_obs,
         "valid_days":     valid_days,
         "low_confidence": low_conf,
         "low_confidence_reason": low_conf_why,
-        "summary": {
-            "min":   round(min(all_prices), 4),
-            "max":   round(max(all_prices), 4),
-            "mean":  round(statistics.mean(all_prices), 4),
-            "stdev": round(statistics.stdev(all_prices), 4) if len(all_prices) > 1 else None,
-        },
+        "summary": window_summary(daily_arrays, all_prices),
         "daily": daily_summaries,
         "methodology": f"Trailing {window_days}-day median $/GPU-hour, "
                        f"outlier removal at {OUTLIER_SIGMA} sigma. "
                        f"See CCIR Methodology v1.1.1.",
-        "calculated_utc": datetime.now(timezone.utc).isoformat(),
     }
+    return result
 
 # ---------------------------------------------------------------------------
 # Write outputs
 # ---------------------------------------------------------------------------
 
-def append_to_index(result: dict, output_path: Path):
+INDEX_HEADER = [
+    "publication_date", "window_start", "window_end",
+    "index_name", "index_value", "total_observations", "valid_days",
+    "low_confidence", "obs_min", "obs_max", "obs_mean", "obs_stdev",
+    "methodology_version", "calculated_utc",
+]
+
+
+def _index_fields(result: dict) -> tuple:
+    """Index CSV columns after publication_date (see INDEX_HEADER)."""
+    start = date.fromisoformat(result["end_date"]) - timedelta(days=result["window_days"] - 1)
+    return (
+        start.isoformat(),
+        result["end_date"],
+        result.get("index_name", "CRI-H100"),
+        result["index_value"],
+        result.get("n_observations", 0),
+        result.get("valid_days", 0),
+        result.get("low_confidence", True),
+        result.get("summary", {}).get("min"),
+        result.get("summary", {}).get("max"),
+        result.get("summary", {}).get("mean"),
+        result.get("summary", {}).get("stdev"),
+        result.get("ccir_version", "1.1.1"),
+        result.get("calculated_utc"),
+    )
+
+
+def _utc_today() -> str:
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+def append_many(results: list, output_path: Path, pub_date: str = None):
+    """
+    Append one index row per result in a single buffered write.
+    Use this for backfills instead of calling append_to_index in a loop.
+    pub_date defaults to today (UTC) and is shared by every row.
+    """
+    if not results:
+        return
+    pub_date = pub_date or _utc_today()
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    write_header = not output_path.exists()
+
+    buf    = io.StringIO()
+    writer = csv.writer(buf)
+    if not output_path.exists():
+        writer.writerow(INDEX_HEADER)
+    writer.writerows((pub_date, *(r.get("_csv_row") or _index_fields(r))) for r in results)
 
     with open(output_path, "a", newline="") as f:
-        writer = csv.writer(f)
-        if write_header:
-            writer.writerow([
-                "publication_date", "window_start", "window_end",
-                "index_name", "index_value", "total_observations", "valid_days",
-                "low_confidence", "obs_min", "obs_max", "obs_mean", "obs_stdev",
-                "methodology_version", "calculated_utc",
-            ])
-        end   = datetime.strptime(result["end_date"], "%Y-%m-%d")
-        start = end - timedelta(days=result["window_days"] - 1)
-        writer.writerow([
-            datetime.now(timezone.utc).strftime("%Y-%m-%d"),
-            start.strftime("%Y-%m-%d"),
-            result["end_date"],
-            result.get("index_name", "CRI-H100"),
-            result["index_value"],
-            result.get("n_observations", 0),
-            result.get("valid_days", 0),
-            result.get("low_confidence", True),
-            result.get("summary", {}).get("min"),
-            result.get("summary", {}).get("max"),
-            result.get("summary", {}).get("mean"),
-            result.get("summary", {}).get("stdev"),
-            result.get("ccir_version", "1.1.1"),
-            result.get("calculated_utc"),
-        ])
+        f.write(buf.getvalue())
     print(f"  Index updated: {output_path}")
 
 
+def append_to_index(result: dict, output_path: Path, pub_date: str = None):
+    append_many([result], output_path, pub_date)
+
+
 def write_audit(result: dict, end_date: str, index_name: str):
     AUDIT_DIR.mkdir(parents=True, exist_ok=True)
     prefix = index_name.lower().replace(" ", "-")
     path = AUDIT_DIR / f"{prefix}-{end_date}.audit.json"
-    with open(path, "w") as f:
-        json.dump(result, f, indent=2)
+    result = {k: v for k, v in result.items() if not k.startswith("_")}
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(path, "w") as f:
+            json.dump(result, f, indent=2)
     print(f"  Audit trail:   {path}")
 
+
+async def write_outputs(result: dict, output_path: Path, end_date: str,
+                        index_name: str, pub_date: str = None):
+    """Write the index row and the audit trail concurrently (independent files)."""
+    await asyncio.gather(
+        asyncio.to_thread(append_to_index, result, output_path, pub_date),
+        asyncio.to_thread(write_audit, result, end_date, index_name),
+    )
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
-def main():
-    parser = argparse.ArgumentParser(description="Calculate weekly CRI index")
-    parser.add_argument("--end-date", default=datetime.now(timezone.utc).strftime("%Y-%m-%d"))
-    parser.add_argument("--window", type=int, default=WINDOW_DAYS)
-    parser.add_argument("--model", default="h100-sxm-us",
-                        choices=list(MODEL_CONFIGS.keys()),
-                        help="Model ID to calculate (default: h100-sxm-us)")
-    args = parser.parse_args()
-
-    config     = MODEL_CONFIGS[args.model]
+def run_one(model_key: str, end_date: str, window_days: int = WINDOW_DAYS,
+            pub_date: str = None):
+    """Calculate one model's index and write its index row and audit trail."""
+    config     = MODEL_CONFIGS[model_key]
     index_name = config["index_name"]
     model_dir  = DATA_DIR / config["data_subdir"]
 
-    print(f"\n{index_name} Calculation — week ending {args.end_date}")
+    print(f"\n{index_name} Calculation — week ending {end_date}")
     print(f"Data source: {model_dir}")
     print("-" * 50)
 
-    result = calculate(model_dir, args.end_date, args.window, index_name)
+    result = calculate(model_dir, end_date, window_days, index_name)
 
     if result["index_value"] is None:
         print("ERROR: No valid observations. Cannot publish.")
@@ -256,20 +546,54 @@ def main():
 
     print(f"  Index value:    ${result['index_value']:.4f} / GPU-hour")
     print(f"  Observations:   {result['n_observations']}")
-    print(f"  Valid days:     {result['valid_days']} / {args.window}")
+    print(f"  Valid days:     {result['valid_days']} / {window_days}")
     if result["low_confidence"]:
         print(f"  WARNING: LOW CONFIDENCE — {result['low_confidence_reason']}")
 
     # Output path — primary model uses the standard path, others use model-specific
-    if args.model == "h100-sxm-us":
+    if model_key == "h100-sxm-us":
         output_path = INDEX_OUTPUT
     else:
         output_path = Path("outputs") / f"{index_name.lower()}-index.csv"
 
-    append_to_index(result, output_path)
-    write_audit(result, args.end_date, index_name)
+    asyncio.run(write_outputs(result, output_path, end_date, index_name, pub_date))
+
+    print(f"\n✓ {index_name} = ${result['index_value']:.4f} (week ending {end_date})")
+
+
+def _run_captured(model_key: str, end_date: str, window_days: int, pub_date: str) -> str:
+    """Worker entry point for --all-models: run one model, return its log text."""
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        run_one(model_key, end_date, window_days, pub_date)
+    return buf.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calculate weekly CRI index")
+    parser.add_argument("--end-date", default=_utc_today())
+    parser.add_argument("--window", type=int, default=WINDOW_DAYS)
+    parser.add_argument("--model", default="h100-sxm-us",
+                        choices=list(MODEL_CONFIGS.keys()),
+                        help="Model ID to calculate (default: h100-sxm-us)")
+    parser.add_argument("--all-models", action="store_true",
+                        help="Calculate every configured model in parallel (ignores --model)")
+    args = parser.parse_args()
+
+    pub_date = _utc_today()
+    if not args.all_models:
+        run_one(args.model, args.end_date, args.window, pub_date)
+        return
 
-    print(f"\n✓ {index_name} = ${result['index_value']:.4f} (week ending {args.end_date})")
+    # Each model reads its own data/<subdir> and writes its own index CSV and
+    # audit file, so workers share no state. Logs are printed in config order.
+    models  = list(MODEL_CONFIGS)
+    workers = min(len(models), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        n = len(models)
+        for log in ex.map(_run_captured, models,
+                          [args.end_date] * n, [args.window] * n, [pub_date] * n):
+            print(log, end="")
 
 
 if __name__ == "__main__":
@@ -9,10 +9,11 @@ The Vast.ai API caps results on broad queries, so targeted per-model
 queries are necessary to get complete listing data for each GPU type.
 
 Usage:
-    python collect.py [--date YYYY-MM-DD] [--data-dir PATH]
+    python collect.py [--date YYYY-MM-DD] [--data-dir PATH] [--compress-archive]
 
 Output:
     data/archive/YYYY-MM-DD.json           — combined raw API responses (all models)
+                                             (.json.zst with --compress-archive)
     data/archive/YYYY-MM-DD.meta.json      — archive provenance + SHA-256
     data/h100-sxm-us/YYYY-MM-DD.csv       — filtered CRI-H100 snapshot
     data/h100-sxm-us/YYYY-MM-DD.meta.json — collection metadata
@@ -21,16 +22,33 @@ Output:
 """
 
 import argparse
+import contextlib
 import csv
 import hashlib
+import io
 import json
-import statistics
+import random
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
+from operator import itemgetter
 from pathlib import Path
 
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # optional accelerator — stdlib json is used instead
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # only needed for --compress-archive
+    zstandard = None
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -38,6 +56,33 @@ import requests
 
 VAST_API_URL       = "https://console.vast.ai/api/v0/bundles/"
 MAX_DAYS_UNCHANGED = 7
+MAX_FETCH_WORKERS  = 8
+MAX_RETRY_DELAY    = 30    # Seconds; cap on the exponential backoff between attempts
+ARCHIVE_ZSTD_LEVEL = 3
+
+# Snapshot CSV columns, in order — rows in write_model_snapshot match this
+_CSV_FIELDS = (
+    "listing_id", "gpu_name", "num_gpus", "dph_total",
+    "dph_per_gpu", "reliability", "geolocation", "datacenter",
+    "last_seen", "gpu_ram_gb", "collected_utc",
+)
+# Offer keys the API always sends, fetched in one C-level call per row.
+# datacenter and last_seen are frequently absent, so they stay on .get().
+_ROW_KEYS = ("id", "gpu_name", "num_gpus", "dph_total", "reliability2", "geolocation", "gpu_ram")
+_get_row  = itemgetter(*_ROW_KEYS)
+
+# One pooled session for the whole run: every model query and retry reuses
+# warm TLS connections to the API host instead of handshaking again. The
+# pool holds one connection per fetch worker; retries stay in our own loop.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_maxsize=MAX_FETCH_WORKERS, max_retries=0))
+
+_PRINT_LOCK = threading.Lock()   # Keeps log lines from concurrent fetches intact
+
+
+def _log(msg: str):
+    with _PRINT_LOCK:
+        print(msg, flush=True)
 
 # ---------------------------------------------------------------------------
 # GPU Model Configurations
@@ -133,12 +178,15 @@ GPU_MODELS = [
 # Fetch — per-model API queries
 # ---------------------------------------------------------------------------
 
-def fetch_model_listings(gpu_name: str, max_retries: int = 3) -> list:
+def fetch_model_listings(gpu_name: str, session: requests.Session = None,
+                         max_retries: int = 3) -> list:
     """
     Fetch all listings for a specific GPU model.
     Uses server-side gpu_name filter to get complete results.
     Requests both rented and unrented to capture utilization data.
+    Uses the module's pooled session unless another one is passed in.
     """
+    http = session or _SESSION
     query = {
         "gpu_name":  {"eq": gpu_name},
         "rentable":  {"eq": True},
@@ -147,33 +195,65 @@ def fetch_model_listings(gpu_name: str, max_retries: int = 3) -> list:
 
     for attempt in range(max_retries):
         try:
-            r = requests.get(VAST_API_URL, params=params, timeout=30)
+            r = http.get(VAST_API_URL, params=params, timeout=30)
             r.raise_for_status()
-            return r.json().get("offers", [])
-        except requests.exceptions.RequestException as e:
+            # Parse straight from the response bytes — no intermediate str
+            data = (orjson.loads if orjson is not None else json.loads)(r.content)
+            return data.get("offers", [])
+        # ValueError covers a non-JSON body (orjson and json decode errors both
+        # subclass it), retried like r.json()'s RequestException was
+        except (requests.exceptions.RequestException, ValueError) as e:
             if attempt < max_retries - 1:
-                print(f"      Attempt {attempt + 1} failed: {e}. Retrying in 10s...")
-                time.sleep(10)
+                # Exponential backoff with jitter: quick recovery from a blip,
+                # and concurrent workers don't retry in lockstep
+                delay = min(MAX_RETRY_DELAY, 2 ** attempt + random.random())
+                _log(f"      {gpu_name}: attempt {attempt + 1} failed: {e}. "
+                     f"Retrying in {delay:.1f}s...")
+                time.sleep(delay)
             else:
-                print(f"      ERROR: Failed after {max_retries} attempts: {e}")
+                _log(f"      {gpu_name}: ERROR: Failed after {max_retries} attempts: {e}")
                 return []
 
 # ---------------------------------------------------------------------------
 # Archive — saves combined responses for all models
 # ---------------------------------------------------------------------------
 
-def write_archive(all_offers: dict, date_str: str, data_dir: Path) -> str:
+class _HashingWriter(io.RawIOBase):
+    """Binary sink that feeds every chunk to a hash before writing it to f."""
+
+    def __init__(self, f, hasher):
+        self._f = f
+        self._hasher = hasher
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._hasher.update(b)
+        self._f.write(b)
+        # Report the whole chunk as consumed, whatever f.write returns (a zstd
+        # stream writer may count compressed output bytes instead), so the
+        # BufferedWriter above never re-sends part of it.
+        return len(b)
+
+
+def write_archive(all_offers: dict, date_str: str, data_dir: Path,
+                  collected_utc: str = None, compress: bool = False) -> str:
     """
     Write combined API responses to archive.
     all_offers: dict of {gpu_name: [offers list]}
-    Returns SHA-256 hash.
+    collected_utc is the run's collection instant (defaults to now); the
+    archive body and its meta.json carry the same value.
+    compress writes YYYY-MM-DD.json.zst instead (requires zstandard).
+    Returns SHA-256 hash of the uncompressed JSON.
     """
+    collected_utc = collected_utc or datetime.now(timezone.utc).isoformat()
     archive_dir = data_dir / "archive"
     archive_dir.mkdir(parents=True, exist_ok=True)
 
     archive_data = {
         "collection_date": date_str,
-        "collected_utc":   datetime.now(timezone.utc).isoformat(),
+        "collected_utc":   collected_utc,
         "source":          "vast.ai public API",
         "description":     "Per-model API queries combined. All geographies, "
                            "rented and unrented. Primary archival record.",
@@ -181,13 +261,28 @@ def write_archive(all_offers: dict, date_str: str, data_dir: Path) -> str:
         "offers_by_model": all_offers,
     }
 
-    archive_path = archive_dir / f"{date_str}.json"
-    raw_bytes = json.dumps(archive_data, separators=(",", ":"), sort_keys=True).encode()
-
-    with open(archive_path, "wb") as f:
-        f.write(raw_bytes)
-
-    sha256 = hashlib.sha256(raw_bytes).hexdigest()
+    archive_path = archive_dir / (f"{date_str}.json.zst" if compress else f"{date_str}.json")
+    # Compact, key-sorted JSON either way. orjson writes floats without
+    # exponents (0.0000278 vs 2.78e-05); values parse identically, and the
+    # SHA-256 below is always taken over the JSON bytes actually produced —
+    # before compression, so it doesn't depend on the zstd version or level.
+    hasher = hashlib.sha256()
+    with open(archive_path, "wb") as f, \
+            (zstandard.ZstdCompressor(level=ARCHIVE_ZSTD_LEVEL).stream_writer(
+                f, closefd=False, write_return_read=True)
+             if compress else contextlib.nullcontext(f)) as sink:
+        if orjson is not None:
+            raw_bytes = orjson.dumps(archive_data, option=orjson.OPT_SORT_KEYS)
+            sink.write(raw_bytes)
+            hasher.update(raw_bytes)
+        else:
+            # Stream the encoder's output through the hasher into the file,
+            # so the serialized archive is never held in memory as one blob
+            with io.TextIOWrapper(io.BufferedWriter(_HashingWriter(sink, hasher)),
+                                  encoding="ascii") as out:
+                json.dump(archive_data, out, separators=(",", ":"), sort_keys=True)
+
+    sha256 = hasher.hexdigest()
 
     # Archive metadata
     total_offers = sum(len(v) for v in all_offers.values())
@@ -196,7 +291,7 @@ def write_archive(all_offers: dict, date_str: str, data_dir: Path) -> str:
     meta = {
         "ccir_version":    "1.1.0",
         "collection_date": date_str,
-        "collected_utc":   datetime.now(timezone.utc).isoformat(),
+        "collected_utc":   collected_utc,
         "source":          "vast.ai public API",
         "archive_type":    "combined_per_model_queries",
         "description":     "Per-model API queries combined into single archive. "
@@ -211,6 +306,8 @@ def write_archive(all_offers: dict, date_str: str, data_dir: Path) -> str:
             "sha256":      sha256,
         },
     }
+    if compress:
+        meta["provenance"]["compression"] = "zstd"   # sha256 is of the decompressed JSON
     meta_path = archive_dir / f"{date_str}.meta.json"
     with open(meta_path, "w") as f:
         json.dump(meta, f, indent=2)
@@ -221,6 +318,31 @@ def write_archive(all_offers: dict, date_str: str, data_dir: Path) -> str:
 # Model-specific filtering (applied to the model's own API results)
 # ---------------------------------------------------------------------------
 
+def _to_float(value) -> float:
+    """float(value), or NaN when the API sent something unusable."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _offer_columns(offers: list) -> dict:
+    """
+    Materialize the fields the filters read into parallel numpy arrays,
+    one element per offer, so filtering is a handful of vectorized masks
+    instead of repeated dict lookups.
+    """
+    return {
+        "rented":      np.array([bool(o.get("rented", False)) for o in offers], dtype=bool),
+        "geolocation": [g if isinstance(g, str) else ""
+                        for g in (o.get("geolocation") for o in offers)],
+        "reliability": np.array([_to_float(o.get("reliability2") or 0) for o in offers]),
+        "num_gpus":    np.array([_to_float(o.get("num_gpus") or 0) for o in offers]),
+        "start_date":  np.array([_to_float(o.get("start_date") or 0) for o in offers]),
+        "dph_total":   np.array([_to_float(o.get("dph_total")) for o in offers]),
+    }
+
+
 def filter_for_model(offers: list, model_config: dict) -> tuple:
     """
     Apply quality filters to a model's API results.
@@ -233,103 +355,87 @@ def filter_for_model(offers: list, model_config: dict) -> tuple:
     geo_suffix      = f", {geography}"
     cutoff          = datetime.now(timezone.utc).timestamp() - (MAX_DAYS_UNCHANGED * 86400)
 
-    counts = {
-        "api_returned":      len(offers),
-        "removed_rented":    0,
-        "removed_geography": 0,
-        "removed_reliability": 0,
-        "removed_min_gpus":  0,
-        "removed_stale":     0,
-        "removed_invalid_price": 0,
-        "final_observations": 0,
-    }
-
-    filtered = []
-    for o in offers:
-        if o.get("rented", False):
-            counts["removed_rented"] += 1
-            continue
-        geo = str(o.get("geolocation", ""))
-        if not (geo.endswith(geo_suffix) or geo == geo_suffix):
-            counts["removed_geography"] += 1
-            continue
-        if (o.get("reliability2") or 0) < min_reliability:
-            counts["removed_reliability"] += 1
-            continue
-        if (o.get("num_gpus") or 0) < min_gpus:
-            counts["removed_min_gpus"] += 1
-            continue
-        if (o.get("start_date") or 0) < cutoff:
-            counts["removed_stale"] += 1
-            continue
-        filtered.append(o)
-
-    # Compute per-GPU prices
-    results = []
-    prices  = []
-    for o in filtered:
-        try:
-            price = float(o["dph_total"]) / int(o["num_gpus"])
-            if price > 0:
-                results.append(o)
-                prices.append(round(price, 6))
-            else:
-                counts["removed_invalid_price"] += 1
-        except (KeyError, TypeError, ValueError, ZeroDivisionError):
-            counts["removed_invalid_price"] += 1
+    cols   = _offer_columns(offers)
+    # A value equal to geo_suffix also ends with it — one endswith suffices
+    endswith = str.endswith
+    geo_ok = np.fromiter((endswith(g, geo_suffix) for g in cols["geolocation"]),
+                         dtype=bool, count=len(offers))
+    gpus   = np.trunc(cols["num_gpus"])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        raw_prices = cols["dph_total"] / gpus
+
+    # Filters apply in order; each count is taken over the offers that
+    # survived the filters before it. Comparisons are written so that they
+    # pass, so a NaN from _to_float (an unusable API value) fails its filter.
+    counts = {"api_returned": len(offers)}
+    keep   = np.ones(len(offers), dtype=bool)
+    for name, passed in (
+        ("removed_rented",        ~cols["rented"]),
+        ("removed_geography",     geo_ok),
+        ("removed_reliability",   cols["reliability"] >= min_reliability),
+        ("removed_min_gpus",      cols["num_gpus"] >= min_gpus),
+        ("removed_stale",         cols["start_date"] >= cutoff),
+        ("removed_invalid_price", (raw_prices > 0) & (gpus != 0)),   # > 0 also rejects NaN
+    ):
+        counts[name] = int(np.count_nonzero(keep & ~passed))
+        keep &= passed
+
+    idx     = np.flatnonzero(keep)
+    results = [offers[i] for i in idx]
+    # builtin round, not np.round — prices land in the hashed CSV verbatim
+    prices  = [round(float(p), 6) for p in raw_prices[idx]]
 
     counts["final_observations"] = len(results)
     return results, prices, counts
 
 
+def _snapshot_rows(listings: list, prices: list, collected_utc: str):
+    """Yield snapshot CSV rows as tuples in _CSV_FIELDS order."""
+    for l, price in zip(listings, prices):
+        try:
+            id_, name, n_gpus, dph, rel, geo, ram = _get_row(l)
+        except KeyError:  # rare: an offer missing one of the usual keys
+            id_, name, n_gpus, dph, rel, geo, ram = map(l.get, _ROW_KEYS)
+        yield (id_, name, n_gpus, dph, price, rel, geo, l.get("datacenter", False),
+               l.get("last_seen"), ram, collected_utc)
+
+
 def write_model_snapshot(listings: list, prices: list, model_config: dict,
                          filter_counts: dict, date_str: str,
-                         data_dir: Path, archive_sha256: str):
-    """Write filtered CSV and metadata for one GPU model."""
+                         data_dir: Path, archive_sha256: str,
+                         collected_utc: str = None):
+    """
+    Write filtered CSV and metadata for one GPU model.
+    collected_utc is the run's collection instant (defaults to now); it is
+    stamped on every CSV row and on the metadata.
+    """
+    collected_utc = collected_utc or datetime.now(timezone.utc).isoformat()
     model_dir = data_dir / model_config["id"]
     model_dir.mkdir(parents=True, exist_ok=True)
 
     csv_path = model_dir / f"{date_str}.csv"
 
-    # Write CSV
-    rows = []
-    for listing, price in zip(listings, prices):
-        rows.append({
-            "listing_id":    listing.get("id"),
-            "gpu_name":      listing.get("gpu_name"),
-            "num_gpus":      listing.get("num_gpus"),
-            "dph_total":     listing.get("dph_total"),
-            "dph_per_gpu":   price,
-            "reliability":   listing.get("reliability2"),
-            "geolocation":   listing.get("geolocation"),
-            "datacenter":    listing.get("datacenter", False),
-            "last_seen":     listing.get("last_seen"),
-            "gpu_ram_gb":    listing.get("gpu_ram"),
-            "collected_utc": datetime.now(timezone.utc).isoformat(),
-        })
-
-    fieldnames = [
-        "listing_id", "gpu_name", "num_gpus", "dph_total",
-        "dph_per_gpu", "reliability", "geolocation", "datacenter",
-        "last_seen", "gpu_ram_gb", "collected_utc",
-    ]
-
-    with open(csv_path, "w", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        if rows:
-            w.writerows(rows)
-
-    csv_sha256 = hashlib.sha256(csv_path.read_bytes()).hexdigest()
-
-    # Price summary
+    # Write CSV — rows are streamed straight to the writer as tuples, and the
+    # encoded bytes are hashed on their way to disk rather than re-read after
+    hasher = hashlib.sha256()
+    with open(csv_path, "wb") as raw, \
+            io.TextIOWrapper(io.BufferedWriter(_HashingWriter(raw, hasher)), newline="") as f:
+        w = csv.writer(f)
+        w.writerow(_CSV_FIELDS)
+        w.writerows(_snapshot_rows(listings, prices, collected_utc))
+
+    csv_sha256 = hasher.hexdigest()
+    csv_stat   = csv_path.stat()
+
+    # Price summary — all statistics from one float64 buffer
+    arr = np.asarray(prices, dtype=np.float64)
     price_summary = {
-        "min":    round(min(prices), 4) if prices else None,
-        "max":    round(max(prices), 4) if prices else None,
-        "mean":   round(statistics.mean(prices), 4) if prices else None,
-        "median": round(statistics.median(prices), 4) if prices else None,
-        "stdev":  round(statistics.stdev(prices), 4) if len(prices) > 1 else None,
-        "n":      len(prices),
+        "min":    round(float(arr.min()), 4) if arr.size else None,
+        "max":    round(float(arr.max()), 4) if arr.size else None,
+        "mean":   round(float(arr.mean()), 4) if arr.size else None,
+        "median": round(float(np.median(arr)), 4) if arr.size else None,
+        "stdev":  round(float(arr.std(ddof=1)), 4) if arr.size > 1 else None,
+        "n":      int(arr.size),
     }
 
     # Metadata
@@ -338,7 +444,7 @@ def write_model_snapshot(listings: list, prices: list, model_config: dict,
         "index_name":      model_config["index_name"],
         "model_id":        model_config["id"],
         "collection_date": date_str,
-        "collected_utc":   datetime.now(timezone.utc).isoformat(),
+        "collected_utc":   collected_utc,
         "source":          "vast.ai public API",
         "target_gpu":      model_config["gpu_name"],
         "geography":       model_config["geography"],
@@ -352,6 +458,9 @@ def write_model_snapshot(listings: list, prices: list, model_config: dict,
         "provenance": {
             "output_file":    str(csv_path),
             "sha256":         csv_sha256,
+            # Let verify.py skip re-hashing a file that hasn't been touched since
+            "size":           csv_stat.st_size,
+            "mtime_ns":       csv_stat.st_mtime_ns,
             "archive_sha256": archive_sha256,
         },
         "low_confidence":        len(prices) < 10,
@@ -376,11 +485,21 @@ def main():
     parser.add_argument("--models", nargs="*", default=None,
                         help="Model IDs to process (default: all). "
                              "E.g. --models h100-sxm-us a100-sxm-us")
+    parser.add_argument("--compress-archive", action="store_true",
+                        help="Write the daily archive as zstd-compressed .json.zst "
+                             "(requires the zstandard package)")
     args = parser.parse_args()
 
+    if args.compress_archive and zstandard is None:
+        print("ERROR: --compress-archive requires the zstandard package "
+              "(pip install zstandard)")
+        sys.exit(1)
+
     date_str = args.date
     data_dir = Path(args.data_dir)
     model_ids = args.models
+    # One collection instant for the whole run, stamped on every output
+    collected_utc = datetime.now(timezone.utc).isoformat()
 
     # Select models
     if model_ids:
@@ -400,27 +519,33 @@ def main():
     # Step 1: Fetch per-model from API
     # ---------------------------------------------------------------
     print(f"\n[1] Fetching listings from Vast.ai...")
-    all_offers = {}
-    total_fetched = 0
-
-    for model in models:
-        gpu_name = model["gpu_name"]
-        print(f"    {gpu_name}...", end=" ", flush=True)
-        offers = fetch_model_listings(gpu_name)
-        all_offers[gpu_name] = offers
-        total_fetched += len(offers)
-        rented = sum(1 for o in offers if o.get("rented", False))
-        unrented = len(offers) - rented
-        print(f"{len(offers)} offers ({unrented} available, {rented} rented)")
-
+    fetched = {}
+
+    # Per-model queries are independent, so issue them concurrently over one
+    # pooled session; wall-clock is ~the slowest query rather than the sum.
+    with ThreadPoolExecutor(max_workers=min(len(models), MAX_FETCH_WORKERS)) as ex:
+        futures = {ex.submit(fetch_model_listings, m["gpu_name"]): m["gpu_name"]
+                   for m in models}
+        for fut in as_completed(futures):
+            gpu_name = futures[fut]
+            offers = fetched[gpu_name] = fut.result()
+            rented = sum(1 for o in offers if o.get("rented", False))
+            unrented = len(offers) - rented
+            _log(f"    {gpu_name}: {len(offers)} offers ({unrented} available, {rented} rented)")
+
+    # Archive keeps the configured model order regardless of completion order
+    all_offers = {m["gpu_name"]: fetched[m["gpu_name"]] for m in models}
+    total_fetched = sum(len(v) for v in all_offers.values())
     print(f"    Total: {total_fetched} offers across {len(models)} models")
 
     # ---------------------------------------------------------------
     # Step 2: Archive combined responses
     # ---------------------------------------------------------------
     print(f"\n[2] Archiving combined responses...")
-    archive_sha256 = write_archive(all_offers, date_str, data_dir)
-    print(f"    Archive: data/archive/{date_str}.json")
+    archive_sha256 = write_archive(all_offers, date_str, data_dir, collected_utc,
+                                   compress=args.compress_archive)
+    archive_ext = ".json.zst" if args.compress_archive else ".json"
+    print(f"    Archive: data/archive/{date_str}{archive_ext}")
     print(f"    SHA-256: {archive_sha256}")
 
     # ---------------------------------------------------------------
@@ -434,7 +559,7 @@ def main():
         offers = all_offers.get(gpu_name, [])
         listings, prices, counts = filter_for_model(offers, model)
         n = write_model_snapshot(listings, prices, model, counts,
-                                date_str, data_dir, archive_sha256)
+                                date_str, data_dir, archive_sha256, collected_utc)
 
         tag = " -- CRI-H100 (primary)" if model["primary"] else ""
         status = ""
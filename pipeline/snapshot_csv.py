@@ -0,0 +1,31 @@
+"""
+Snapshot CSV fast path, shared by calculate.py and verify.py.
+
+Daily snapshots have a fixed schema, and most rows quote nothing at all.
+For those rows a plain str.split finds the same fields csv.reader would;
+any quote means a field may hold a delimiter or a line break, so the
+caller falls back to the csv module for the whole file.
+"""
+
+import numpy as np
+
+
+def split_prices(lines, idx: int):
+    """
+    Column idx (dph_per_gpu) of each line as a float64 array, split on ","
+    without the csv module. Unparseable or missing values are NaN, as with
+    csv.reader. Returns None as soon as a line contains a quote.
+    """
+    prices = []
+    for line in lines:
+        if '"' in line:
+            return None
+        fields = line.split(",", idx + 1)
+        if len(fields) > idx:
+            try:
+                prices.append(float(fields[idx]))
+                continue
+            except ValueError:
+                pass
+        prices.append(np.nan)
+    return np.array(prices, dtype=np.float64)
@@ -9,6 +9,7 @@ this script, any counterparty can verify any published index value.
 
 Usage:
     python verify.py --end-date YYYY-MM-DD [--model h100-sxm-us]
+    python verify.py --all-weeks [--model h100-sxm-us]
 
 Example:
     python verify.py --end-date 2026-03-01
@@ -24,14 +25,40 @@ Example:
 """
 
 import argparse
+import contextlib
 import csv
+import functools
 import hashlib
+import io
 import json
-import statistics
+import locale
+import mmap
+import os
 import sys
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, timedelta
 from pathlib import Path
 
+import numpy as np
+
+from snapshot_csv import split_prices
+
+try:
+    import numba
+except ImportError:  # optional accelerator — the numpy path is used as-is
+    numba = None
+
+try:
+    import blake3
+except ImportError:  # only needed for snapshots that record a blake3 digest
+    blake3 = None
+
+try:
+    import pandas as pd
+except ImportError:  # optional accelerator — the csv module is used instead
+    pd = None
+
 # Must match CCIR Methodology v1.1.1 exactly
 OUTLIER_SIGMA        = 2.5
 WINDOW_DAYS          = 7
@@ -39,150 +66,434 @@ MIN_OBSERVATIONS_DAY = 8
 
 DATA_DIR      = Path("data")
 INDEX_OUTPUT  = Path("outputs/cri-h100-index.csv")
+# Digests recorded_hash understands in meta.json provenance; blake3 needs the
+# optional blake3 package, the rest come with hashlib
+HASH_ALGORITHMS = ("sha256", "blake2b", "blake3")
+HASH_CACHE    = Path("outputs/.cache/verify-hashes.json")   # Snapshot SHA-256 by size/mtime; safe to delete
+# How load_snapshot decided a snapshot's hash check, and its report label
+# (UNCHECKED: a digest is recorded, but in an algorithm not available here)
+HASHED, CACHED, STAT, UNCHECKED = "hashed", "cached", "stat", "unchecked"
+HASH_LABELS = {HASHED: " [hash ✓]", CACHED: " [hash ✓ cached]", STAT: " [stat ✓]"}
+
+
+@dataclass(frozen=True)
+class ModelCfg:
+    """Where one index's snapshots and published series live."""
+    __slots__ = ("index_name", "data_subdir", "index_csv")
+    index_name:  str
+    data_subdir: str
+    index_csv:   Path
+
 
 MODEL_CONFIGS = {
-    "h100-sxm-us":  {"index_name": "CRI-H100",      "data_subdir": "h100-sxm-us",
-                      "index_csv": "outputs/cri-h100-index.csv"},
-    "a100-sxm-us":  {"index_name": "CRI-A100",       "data_subdir": "a100-sxm-us",
-                      "index_csv": "outputs/cri-a100-index.csv"},
-    "a100-pcie-us": {"index_name": "CRI-A100-PCIe",  "data_subdir": "a100-pcie-us",
-                      "index_csv": "outputs/cri-a100-pcie-index.csv"},
-    "h200-us":      {"index_name": "CRI-H200",       "data_subdir": "h200-us",
-                      "index_csv": "outputs/cri-h200-index.csv"},
-    "h200-nvl-us":  {"index_name": "CRI-H200-NVL",   "data_subdir": "h200-nvl-us",
-                      "index_csv": "outputs/cri-h200-nvl-index.csv"},
-    "h100-pcie-us": {"index_name": "CRI-H100-PCIe",  "data_subdir": "h100-pcie-us",
-                      "index_csv": "outputs/cri-h100-pcie-index.csv"},
-    "v100-us":      {"index_name": "CRI-V100",        "data_subdir": "v100-us",
-                      "index_csv": "outputs/cri-v100-index.csv"},
-    "l40s-us":      {"index_name": "CRI-L40S",        "data_subdir": "l40s-us",
-                      "index_csv": "outputs/cri-l40s-index.csv"},
-    "rtx4090-us":   {"index_name": "CRI-4090",        "data_subdir": "rtx4090-us",
-                      "index_csv": "outputs/cri-4090-index.csv"},
+    "h100-sxm-us":  ModelCfg("CRI-H100",      "h100-sxm-us",  Path("outputs/cri-h100-index.csv")),
+    "a100-sxm-us":  ModelCfg("CRI-A100",      "a100-sxm-us",  Path("outputs/cri-a100-index.csv")),
+    "a100-pcie-us": ModelCfg("CRI-A100-PCIe", "a100-pcie-us", Path("outputs/cri-a100-pcie-index.csv")),
+    "h200-us":      ModelCfg("CRI-H200",      "h200-us",      Path("outputs/cri-h200-index.csv")),
+    "h200-nvl-us":  ModelCfg("CRI-H200-NVL",  "h200-nvl-us",  Path("outputs/cri-h200-nvl-index.csv")),
+    "h100-pcie-us": ModelCfg("CRI-H100-PCIe", "h100-pcie-us", Path("outputs/cri-h100-pcie-index.csv")),
+    "v100-us":      ModelCfg("CRI-V100",      "v100-us",      Path("outputs/cri-v100-index.csv")),
+    "l40s-us":      ModelCfg("CRI-L40S",      "l40s-us",      Path("outputs/cri-l40s-index.csv")),
+    "rtx4090-us":   ModelCfg("CRI-4090",      "rtx4090-us",   Path("outputs/cri-4090-index.csv")),
 }
 
 
-def load_prices(model_dir: Path, date_str: str):
-    path = model_dir / f"{date_str}.csv"
-    if not path.exists():
-        return None
-    prices = []
-    with open(path, newline="") as f:
-        for row in csv.DictReader(f):
-            try:
-                prices.append(float(row["dph_per_gpu"]))
-            except (KeyError, ValueError):
-                continue
-    return prices if prices else None
+def _read_prices_pandas(buf):
+    """Column-pruned read via pandas' C parser; None if it can't handle the file."""
+    try:
+        # round_trip: pandas' default fast float parser is not correctly
+        # rounded, and every value must equal Python's float() bit for bit
+        return pd.read_csv(buf, usecols=["dph_per_gpu"],
+                           dtype={"dph_per_gpu": np.float64}, engine="c",
+                           float_precision="round_trip")["dph_per_gpu"].to_numpy()
+    except ValueError:
+        return None  # Empty file, missing column, non-numeric value or bad encoding
+
+
+def _parse_price(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan   # Dropped with the other non-finite values in load_snapshot
+
+
+def _read_prices_csv(buf):
+    # Same text decoding open() would apply, one line of the mapping at a time
+    encoding = locale.getpreferredencoding(False)
+    def lines():
+        return (line.decode(encoding) for line in iter(buf.readline, b""))
+    # Resolve the column position once rather than building a dict per row
+    try:
+        idx = next(csv.reader(lines())).index("dph_per_gpu")
+    except (StopIteration, ValueError):
+        return np.empty(0)
+    # Snapshots without quoted fields never need the csv module
+    start  = buf.tell()
+    prices = split_prices(lines(), idx)
+    if prices is not None:
+        return prices
+    buf.seek(start)
+    return np.fromiter(
+        (_parse_price(row[idx]) if len(row) > idx else np.nan for row in csv.reader(lines())),
+        dtype=np.float64,
+    )
+
+
+def load_provenance(meta_path: Path) -> dict:
+    """The provenance block of a snapshot's meta.json (empty if there is none)."""
+    if not meta_path.exists():
+        return {}  # Can't verify
+    with open(meta_path) as f:
+        return json.load(f).get("provenance", {})
+
+
+def recorded_hash(provenance: dict):
+    """
+    (algorithm, hex digest) recorded in a snapshot's provenance, or None if
+    there is nothing to check against. The digest is recorded as
+    "sha256": <hex>, or as a self-describing "hash": "<algorithm>:<hex>" for
+    any of HASH_ALGORITHMS.
+    """
+    alg, sep, digest = (provenance.get("hash") or "").partition(":")
+    if sep:
+        return alg.lower(), digest.lower()
+    if provenance.get("sha256"):
+        return "sha256", provenance["sha256"].lower()
+    return None
 
 
-def verify_hash(model_dir: Path, date_str: str):
-    """Verify SHA-256 hash of daily snapshot against recorded metadata."""
-    csv_path  = model_dir / f"{date_str}.csv"
-    meta_path = model_dir / f"{date_str}.meta.json"
+def _hash_bytes(buf, alg: str):
+    """Hex digest of buf under alg, or None if alg is unknown or its package missing."""
+    if alg == "blake3":
+        return blake3.blake3(buf).hexdigest() if blake3 is not None else None
+    if alg in HASH_ALGORITHMS:
+        return hashlib.new(alg, buf).hexdigest()
+    return None
 
-    if not csv_path.exists() or not meta_path.exists():
-        return None  # Can't verify
 
-    actual_hash = hashlib.sha256(csv_path.read_bytes()).hexdigest()
-    with open(meta_path) as f:
-        meta = json.load(f)
-    recorded_hash = meta.get("provenance", {}).get("sha256")
-
-    if recorded_hash is None:
-        return None
-    return actual_hash == recorded_hash
-
-
-def remove_outliers(prices: list):
-    if len(prices) < 4:
-        return prices, 0
-    sorted_p = sorted(prices)
-    trim_n   = max(1, int(len(sorted_p) * 0.10))
-    trimmed  = sorted_p[trim_n:-trim_n]
-    t_mean   = statistics.mean(trimmed)
-    stdev    = statistics.stdev(prices)
+def load_hash_cache() -> dict:
+    try:
+        with open(HASH_CACHE) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_hash_cache(cache: dict) -> None:
+    HASH_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = HASH_CACHE.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(cache, f, sort_keys=True)
+    os.replace(tmp, HASH_CACHE)  # Atomic: a concurrent run never reads half a file
+
+
+def _snapshot_digest(buf, alg: str, csv_path: Path, st: os.stat_result,
+                     hash_cache: dict = None):
+    """
+    (digest, from_cache) of buf (the mapped contents of csv_path) under alg.
+    With a hash_cache, a file whose size and mtime_ns match an earlier run
+    reuses that run's digest, and fresh digests are recorded for the next one.
+    Only the actual hash is cached — it is still compared against meta.json
+    every time.
+    """
+    if hash_cache is None:
+        return _hash_bytes(buf, alg), False
+    key = str(csv_path)
+    entry = hash_cache.get(key)
+    if not (entry and entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns):
+        entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if alg not in entry:
+        digest = _hash_bytes(buf, alg)
+        if digest is None:
+            return None, False
+        # Workers write distinct keys; single dict stores are atomic under the GIL
+        hash_cache[key] = {**entry, alg: digest}
+        return digest, False
+    return entry[alg], True
+
+
+def load_snapshot(csv_path: Path, meta_path: Path, hash_cache: dict = None,
+                  strict: bool = False) -> tuple:
+    """
+    Read one daily snapshot through a single read-only memory map: the same
+    pages feed the integrity check and the price parser, so the file is paged
+    in once and never copied onto the heap.
+
+    Returns (prices, hash_ok, hash_basis, hash_alg). prices is the finite
+    dph_per_gpu values as a float64 array, or None if the file is missing or
+    holds none. hash_ok is whether the file matches the digest recorded in
+    meta_path, or None if it couldn't be checked. hash_basis says how hash_ok
+    was decided: HASHED, CACHED (a digest from hash_cache, see
+    _snapshot_digest) or STAT, or UNCHECKED when the recorded algorithm isn't
+    available here; None when no digest is recorded. hash_alg is the
+    recorded algorithm (None if there is none).
+
+    A file whose size and mtime_ns still equal those collect.py recorded in
+    its provenance is taken as untouched without hashing (STAT). strict=True
+    hashes it regardless.
+    """
+    try:
+        f = open(csv_path, "rb")
+    except FileNotFoundError:
+        return None, None, None, None
+    provenance = load_provenance(meta_path)
+    recorded   = recorded_hash(provenance)
+    hash_alg   = recorded[0] if recorded else None
+
+    def check(buf):
+        if recorded is None:
+            return None, None
+        if (not strict and provenance.get("size") == st.st_size
+                and provenance.get("mtime_ns") == st.st_mtime_ns):
+            return True, STAT
+        actual, from_cache = _snapshot_digest(buf, recorded[0], csv_path, st, hash_cache)
+        if actual is None:
+            return None, UNCHECKED
+        return actual == recorded[1], CACHED if from_cache else HASHED
+
+    with f:
+        st = os.fstat(f.fileno())
+        if st.st_size == 0:  # mmap rejects empty files
+            return (None, *check(b""), hash_alg)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):  # Not on Windows
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            hash_ok, hash_basis = check(mm)
+            prices = _read_prices_pandas(mm) if pd is not None else None
+            if prices is None:
+                mm.seek(0)
+                prices = _read_prices_csv(mm)
+    prices = prices[np.isfinite(prices)]   # as calculate.py: NaN/inf never enter the index
+    return (prices if prices.size else None), hash_ok, hash_basis, hash_alg
+
+
+def _jit(func):
+    """Compile func with numba when it is installed; otherwise return it unchanged."""
+    if numba is None:
+        return func
+    # No fastmath: reassociated sums would drift from the published values.
+    return numba.njit(cache=True)(func)
+
+
+@_jit
+def _clean_prices(arr, sigma, trimmed_stdev):
+    n        = arr.size
+    trim_n   = max(1, int(n * 0.10))
+    lo, hi   = trim_n, n - trim_n
+    # Two-sided partition selects the trimmed window in O(n) — no full sort
+    trimmed  = np.partition(arr, np.array([lo, hi - 1]))[lo:hi]
+    t_mean   = trimmed.mean()
+    spread   = trimmed if trimmed_stdev else arr
+    # Identical values have a stdev of exactly 0 and nothing is dropped.
+    # Tested directly, as the float mean below can leave a ~1e-17 residue
+    # that would put every price "beyond" 2.5 sigma.
+    if spread.min() == spread.max():
+        return arr
+    # Sample stdev (ddof=1) spelled out — numba's ndarray.std takes no ddof.
+    stdev    = np.sqrt(((spread - spread.mean()) ** 2).sum() / (spread.size - 1))
     if stdev == 0:
-        return prices, 0
-    threshold = OUTLIER_SIGMA * stdev
-    cleaned   = [p for p in prices if abs(p - t_mean) <= threshold]
-    return cleaned, len(prices) - len(cleaned)
-
-
-def get_published_value(index_csv: Path, end_date: str, value_col: str = None):
+        return arr
+    # |x - t_mean| computed in place in one scratch buffer rather than as two
+    # temporaries (difference, then abs)
+    dev = arr - t_mean
+    np.abs(dev, dev)
+    return arr[dev <= sigma * stdev]
+
+
+def remove_outliers(prices, trimmed_stdev: bool = False):
+    """
+    Methodology v1.1.1: drop observations more than OUTLIER_SIGMA sample
+    stdevs of the full series away from the 10%-trimmed mean.
+
+    trimmed_stdev=True takes the stdev over the trimmed window instead, so
+    outliers no longer widen their own threshold. That is a proposed v1.2
+    change, not current methodology: results computed with it will not
+    reproduce values published under v1.1.1.
+    """
+    # Compiled code needs a contiguous float64 buffer of its own.
+    arr = np.ascontiguousarray(prices, dtype=np.float64)
+    if arr.size < 4:
+        return arr, 0
+    cleaned = _clean_prices(arr, OUTLIER_SIGMA, trimmed_stdev)
+    return cleaned, arr.size - cleaned.size
+
+
+@functools.lru_cache(maxsize=None)
+def _load_published(index_csv: Path, value_col: str = None) -> dict:
+    """{window end date: published value or None} from one pass over the index CSV."""
+    published = {}
     if not index_csv.exists():
-        return None
+        return published
     with open(index_csv, newline="") as f:
-        for row in csv.DictReader(f):
-            if row["end_date"] == end_date:
-                # Try model-specific column, fall back to common names
-                for col in [value_col, "index_value", "cri_h100"]:
-                    if col and col in row:
-                        val = row[col]
-                        return float(val) if val else None
-    return None
+        reader = csv.reader(f)
+        header = next(reader, [])
+        # calculate.py writes window_end; early series used end_date
+        date_col = next((c for c in ("window_end", "end_date") if c in header), None)
+        # Try model-specific column, fall back to common names
+        val_col  = next((c for c in (value_col, "index_value", "cri_h100") if c and c in header), None)
+        if date_col is None or val_col is None:
+            return published
+        d_idx, v_idx = header.index(date_col), header.index(val_col)
+        for row in reader:
+            if len(row) <= max(d_idx, v_idx):
+                continue
+            val = row[v_idx]
+            # First row for a date wins, as the series is append-only
+            published.setdefault(row[d_idx], float(val) if val else None)
+    return published
 
 
-def verify(end_date: str, model_id: str = "h100-sxm-us"):
+def get_published_value(index_csv: Path, end_date: str, value_col: str = None):
+    return _load_published(index_csv, value_col).get(end_date)
+
+
+def window_days(model_dir: Path, end_date: str) -> list:
+    """(date_str, csv_path, meta_path) for each day of the window, oldest first."""
+    end = date.fromisoformat(end_date)
+    days = []
+    for i in range(WINDOW_DAYS - 1, -1, -1):
+        date_str = (end - timedelta(days=i)).isoformat()
+        days.append((date_str, model_dir / f"{date_str}.csv", model_dir / f"{date_str}.meta.json"))
+    return days
+
+
+def prefetch(paths) -> None:
+    """
+    Ask the kernel to start reading every file now (POSIX_FADV_WILLNEED), so
+    cold-cache reads for the whole window are queued at once rather than as
+    each worker reaches its file. A no-op where posix_fadvise is unavailable.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue  # Missing files are reported by process_day
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+
+
+def process_day(day_paths: tuple, hash_cache: dict = None, trimmed_stdev: bool = False,
+                strict: bool = False) -> dict:
+    """Hash check, load, outlier removal and median for one window_days entry."""
+    date_str, csv_path, meta_path = day_paths
+    raw, hash_ok, hash_basis, hash_alg = load_snapshot(csv_path, meta_path, hash_cache, strict)
+    day = {"date": date_str, "hash_ok": hash_ok, "hash_basis": hash_basis, "hash_alg": hash_alg,
+           "n_raw": None, "cleaned": None, "n_removed": 0, "median": None}
+    if raw is None:
+        return day
+    day["n_raw"] = len(raw)
+    if len(raw) < MIN_OBSERVATIONS_DAY:
+        return day
+    cleaned, day["n_removed"] = remove_outliers(raw, trimmed_stdev)
+    day["cleaned"] = cleaned
+    if cleaned.size:
+        day["median"] = float(np.median(cleaned))
+    return day
+
+
+def _verify(end_date: str, model_id: str, hash_cache: dict, trimmed_stdev: bool,
+            days_cache: dict = None, strict: bool = False) -> int:
     config     = MODEL_CONFIGS[model_id]
-    index_name = config["index_name"]
-    model_dir  = DATA_DIR / config["data_subdir"]
-    index_csv  = Path(config["index_csv"])
+    index_name = config.index_name
+    model_dir  = DATA_DIR / config.data_subdir
+    index_csv  = config.index_csv
 
     print(f"\nReproducing {index_name} — week ending {end_date}")
     print(f"Data source: {model_dir}")
+    if trimmed_stdev:
+        print("Outlier threshold: stdev of the trimmed window (proposed v1.2) — "
+              "will not match v1.1.1 publications")
     print("-" * 52)
 
-    end   = datetime.strptime(end_date, "%Y-%m-%d").date()
-    dates = [(end - timedelta(days=i)).strftime("%Y-%m-%d")
-             for i in range(WINDOW_DAYS - 1, -1, -1)]
+    window = window_days(model_dir, end_date)
 
-    all_prices = []
+    day_arrays = []   # Cleaned prices per valid day; joined once for the window median
     valid_days = 0
     hash_failures = 0
-
-    for date_str in dates:
-        # Verify data integrity
-        hash_ok = verify_hash(model_dir, date_str)
+    not_rehashed  = {CACHED: 0, STAT: 0}   # Days passed without hashing them this run
+    unchecked     = {}                     # Algorithm -> days whose digest couldn't be checked
+
+    # days_cache carries processed days between calls: consecutive windows
+    # share most of their days, and each is read and cleaned only once.
+    days_cache = {} if days_cache is None else days_cache
+    todo = [day for day in window if day[0] not in days_cache]
+    if todo:
+        # Days are independent and their hashing and file reads release the
+        # GIL, so all of them run concurrently.
+        prefetch(path for _, csv_path, meta_path in todo for path in (csv_path, meta_path))
+        with ThreadPoolExecutor(max_workers=len(todo)) as ex:
+            for day in ex.map(functools.partial(process_day, hash_cache=hash_cache,
+                                                trimmed_stdev=trimmed_stdev,
+                                                strict=strict), todo):
+                days_cache[day["date"]] = day
+    days = [days_cache[date_str] for date_str, _, _ in window]
+
+    for day in days:
+        date_str = day["date"]
         hash_status = ""
-        if hash_ok is True:
-            hash_status = " [hash ✓]"
-        elif hash_ok is False:
+        if day["hash_ok"] is True:
+            hash_status = HASH_LABELS[day["hash_basis"]]
+            if day["hash_basis"] in not_rehashed:
+                not_rehashed[day["hash_basis"]] += 1
+        elif day["hash_ok"] is False:
             hash_status = " [HASH MISMATCH ✗]"
             hash_failures += 1
+        elif day["hash_basis"] == UNCHECKED:
+            hash_status = f" [hash unchecked: {day['hash_alg']} unavailable]"
+            unchecked[day["hash_alg"]] = unchecked.get(day["hash_alg"], 0) + 1
 
-        raw = load_prices(model_dir, date_str)
-
-        if raw is None:
+        n_raw = day["n_raw"]
+        if n_raw is None:
             print(f"  {date_str}: MISSING")
             continue
 
-        if len(raw) < MIN_OBSERVATIONS_DAY:
-            print(f"  {date_str}: LOW CONFIDENCE ({len(raw)} obs < {MIN_OBSERVATIONS_DAY} minimum)")
+        if n_raw < MIN_OBSERVATIONS_DAY:
+            print(f"  {date_str}: LOW CONFIDENCE ({n_raw} obs < {MIN_OBSERVATIONS_DAY} minimum)")
             continue
 
-        cleaned, n_removed = remove_outliers(raw)
-        if not cleaned:
+        cleaned = day["cleaned"]
+        if cleaned.size == 0:
             print(f"  {date_str}: EMPTY after outlier removal")
             continue
 
-        day_median = statistics.median(cleaned)
-        all_prices.extend(cleaned)
+        day_arrays.append(cleaned)
         valid_days += 1
-        print(f"  {date_str}: {len(raw)} obs → {len(cleaned)} after outlier removal "
-              f"({n_removed} removed), median ${day_median:.4f}{hash_status}")
+        print(f"  {date_str}: {n_raw} obs → {cleaned.size} after outlier removal "
+              f"({day['n_removed']} removed), median ${day['median']:.4f}{hash_status}")
 
     print()
 
     if hash_failures > 0:
         print(f"  WARNING: {hash_failures} day(s) had hash mismatches — data may have been modified.")
         print()
+    if unchecked:
+        algs = ", ".join(f"{alg} ({n} day(s))" for alg, n in sorted(unchecked.items()))
+        print(f"  WARNING: integrity not checked — digest algorithm unavailable here: {algs}.")
+        if strict:
+            print("  --strict: treating unchecked snapshots as a failure.")
+        print()
+    if not_rehashed[CACHED]:
+        print(f"  NOTE: {not_rehashed[CACHED]} day(s) checked with a digest cached by an "
+              f"earlier run [hash ✓ cached].")
+    if not_rehashed[STAT]:
+        print(f"  NOTE: {not_rehashed[STAT]} day(s) not hashed — size and mtime match the "
+              f"recorded provenance [stat ✓].")
+    if any(not_rehashed.values()):
+        print("  Run with --strict to hash every snapshot.")
+        print()
 
-    if not all_prices:
+    if not day_arrays:
         print("ERROR: No valid observations. Cannot reproduce index value.")
-        sys.exit(1)
+        return 1
 
-    reproduced = round(statistics.median(all_prices), 4)
+    # The concatenation is a fresh buffer nothing else reads, so the median's
+    # selection may reorder it in place instead of partitioning a copy
+    all_prices = np.concatenate(day_arrays)
+    reproduced = round(float(np.median(all_prices, overwrite_input=True)), 4)
     published  = get_published_value(index_csv, end_date)
 
     print(f"  Reproduced value: ${reproduced:.4f}")
@@ -191,26 +502,107 @@ def verify(end_date: str, model_id: str = "h100-sxm-us"):
         print(f"  Published value:  NOT FOUND in {index_csv}")
         print(f"\n  Cannot verify — no published value found for {end_date}.")
         print(f"  Reproduced {index_name} = ${reproduced:.4f}")
-        sys.exit(1)
+        return 1
 
     print(f"  Published value:  ${published:.4f}")
     print()
 
     if reproduced == published:
         print(f"  MATCH ✓  {index_name} = ${reproduced:.4f} independently verified.")
-        sys.exit(0)
+        return 1 if strict and unchecked else 0
     else:
         diff = abs(reproduced - published)
         print(f"  MISMATCH ✗  Difference: ${diff:.6f}")
         print(f"  If this is unexpected, check raw data integrity and methodology version.")
-        sys.exit(1)
+        return 1
+
+
+def _report(run, use_hash_cache: bool) -> int:
+    """
+    Call run(hash_cache) with its printed report buffered and written out in
+    one go, then persist any new snapshot digests. Returns run's exit code.
+    """
+    hash_cache = load_hash_cache() if use_hash_cache else None
+    cached = dict(hash_cache) if hash_cache is not None else None
+    buf = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buf):
+            code = run(hash_cache)
+    finally:
+        # One write for the whole report rather than a syscall per line
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+    if hash_cache != cached:   # Only rewrite the cache when a digest was added or replaced
+        save_hash_cache(hash_cache)
+    return code
+
+
+def verify(end_date: str, model_id: str = "h100-sxm-us", use_hash_cache: bool = True,
+           trimmed_stdev: bool = False, strict: bool = False):
+    """
+    Print the reproduction report; exit 0 on a match with the published value,
+    else 1. strict=True hashes every snapshot, trusting neither recorded file
+    stats nor the hash cache, and also exits 1 if any snapshot's digest is in
+    an algorithm that can't be checked here.
+    """
+    sys.exit(_report(lambda hash_cache: _verify(end_date, model_id, hash_cache, trimmed_stdev,
+                                                strict=strict),
+                     use_hash_cache and not strict))
+
+
+def _verify_all(model_id: str, hash_cache: dict, trimmed_stdev: bool, strict: bool) -> int:
+    config = MODEL_CONFIGS[model_id]
+    end_dates = list(_load_published(config.index_csv))
+    if not end_dates:
+        print(f"ERROR: No published values found in {config.index_csv}")
+        return 1
+
+    days_cache = {}
+    failed = [end_date for end_date in end_dates
+              if _verify(end_date, model_id, hash_cache, trimmed_stdev, days_cache, strict) != 0]
+
+    print(f"\n{'=' * 52}")
+    print(f"{config.index_name}: {len(end_dates) - len(failed)} of {len(end_dates)} "
+          f"published weeks reproduced.")
+    if failed:
+        print(f"  Not reproduced: {', '.join(failed)}")
+    return 1 if failed else 0
+
+
+def verify_all(model_id: str = "h100-sxm-us", use_hash_cache: bool = True,
+               trimmed_stdev: bool = False, strict: bool = False):
+    """
+    Verify every week in the model's published series in one pass. Each daily
+    snapshot is hashed, read and cleaned once however many windows include it.
+    Exits 0 only if every week matches. strict is as for verify.
+    """
+    sys.exit(_report(lambda hash_cache: _verify_all(model_id, hash_cache, trimmed_stdev, strict),
+                     use_hash_cache and not strict))
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Independently verify a CRI index value")
-    parser.add_argument("--end-date", required=True, help="Week-ending date (YYYY-MM-DD)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--end-date", help="Week-ending date (YYYY-MM-DD)")
+    target.add_argument("--all-weeks", action="store_true",
+                        help="Verify every week in the model's published index series")
     parser.add_argument("--model", default="h100-sxm-us",
                         choices=list(MODEL_CONFIGS.keys()),
                         help="Model ID to verify (default: h100-sxm-us)")
+    parser.add_argument("--no-hash-cache", action="store_true",
+                        help=f"Don't reuse digests of unchanged files from {HASH_CACHE}. "
+                             f"Snapshots whose size and mtime match their recorded "
+                             f"provenance are still not hashed; see --strict")
+    parser.add_argument("--strict", action="store_true",
+                        help="Hash every snapshot, even those whose size and mtime still "
+                             "match their recorded provenance (implies --no-hash-cache), "
+                             "and fail if any digest can't be checked here")
+    parser.add_argument("--trimmed-stdev", action="store_true",
+                        help="Preview the proposed v1.2 outlier threshold (stdev of the "
+                             "trimmed window). Does not reproduce v1.1.1 published values.")
     args = parser.parse_args()
-    verify(args.end_date, args.model)
+    if args.all_weeks:
+        verify_all(args.model, use_hash_cache=not args.no_hash_cache,
+                   trimmed_stdev=args.trimmed_stdev, strict=args.strict)
+    verify(args.end_date, args.model, use_hash_cache=not args.no_hash_cache,
+           trimmed_stdev=args.trimmed_stdev, strict=args.strict)
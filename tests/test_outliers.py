@@ -0,0 +1,107 @@
+"""
+Regression tests: outlier removal and the index median against the original
+statistics-based v1.1.1 implementation, on duplicate-heavy inputs.
+
+Run from the repository root:
+    python -m unittest discover tests
+"""
+
+import statistics
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "pipeline"))
+
+import calculate  # noqa: E402
+import verify     # noqa: E402
+
+SIGMA = 2.5
+
+
+def baseline_remove_outliers(prices: list) -> list:
+    """Methodology v1.1.1 as first published, on Python floats."""
+    if len(prices) < 4:
+        return list(prices)
+    sorted_p = sorted(prices)
+    trim_n   = max(1, int(len(sorted_p) * 0.10))
+    t_mean   = statistics.mean(sorted_p[trim_n:-trim_n])
+    stdev    = statistics.stdev(prices)
+    if stdev == 0:
+        return list(prices)
+    return [p for p in prices if abs(p - t_mean) <= SIGMA * stdev]
+
+
+CASES = {
+    "constant 2.49":      [2.49] * 40,
+    "constant 0.1":       [0.1] * 56,
+    "zeros":              [0.0] * 1000,
+    "mostly duplicates":  [0.35] * 7 + [0.29, 0.31, 0.40, 0.42, 0.45, 0.5, 1.9],
+    "duplicates + spike": [1.8] * 30 + [25.0],
+}
+
+
+class RemoveOutliersTest(unittest.TestCase):
+
+    def test_calculate_matches_baseline(self):
+        for name, prices in CASES.items():
+            with self.subTest(name):
+                cleaned, n_removed = calculate.remove_outliers(np.array(prices))
+                expected = sorted(baseline_remove_outliers(prices))
+                self.assertEqual(cleaned.tolist(), expected)
+                self.assertEqual(n_removed, len(prices) - len(expected))
+
+    def test_verify_matches_baseline(self):
+        for name, prices in CASES.items():
+            with self.subTest(name):
+                cleaned, n_removed = verify.remove_outliers(np.array(prices))
+                expected = sorted(baseline_remove_outliers(prices))
+                self.assertEqual(sorted(cleaned.tolist()), expected)
+                self.assertEqual(n_removed, len(prices) - len(expected))
+
+    def test_trimmed_stdev_keeps_constant_window(self):
+        # Outliers around an all-identical trimmed window: its stdev is
+        # exactly 0, so nothing is dropped.
+        prices = [0.1] * 3 + [2.49] * 40 + [9.0] * 3
+        cleaned, n_removed = verify.remove_outliers(np.array(prices), trimmed_stdev=True)
+        self.assertEqual(n_removed, 0)
+        self.assertEqual(sorted(cleaned.tolist()), sorted(prices))
+
+
+class CalculateTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self._cache_dir = calculate.CACHE_DIR
+        calculate.CACHE_DIR = self.root / "cache"
+        self.addCleanup(setattr, calculate, "CACHE_DIR", self._cache_dir)
+        calculate._calculate_memo.cache_clear()
+
+    def write_days(self, model_dir: Path, end_date: str, daily_prices: list):
+        model_dir.mkdir(parents=True)
+        dates = list(calculate.window_dates(end_date, len(daily_prices)))
+        for date_str, prices in zip(dates, daily_prices):
+            rows = "".join(f"{i},{p!r}\n" for i, p in enumerate(prices))
+            (model_dir / f"{date_str}.csv").write_text("listing_id,dph_per_gpu\n" + rows)
+
+    def test_constant_days_publish_baseline_median(self):
+        for value in (2.49, 0.1, 0.0):
+            with self.subTest(value=value):
+                model_dir = self.root / f"m{value}"
+                daily = [[value] * 20 for _ in range(7)]
+                self.write_days(model_dir, "2026-03-06", daily)
+                result = calculate.calculate(model_dir, "2026-03-06")
+
+                kept = [p for day in daily for p in baseline_remove_outliers(day)]
+                self.assertEqual(result["valid_days"], 7)
+                self.assertEqual(result["n_observations"], len(kept))
+                self.assertEqual(result["index_value"], round(statistics.median(kept), 4))
+
+
+if __name__ == "__main__":
+    unittest.main()